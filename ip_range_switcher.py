@@ -8,64 +8,298 @@ IP Range Switcher – Windows  (v2.0)
 • Pure std‑lib; PyInstaller‑friendly.
 """
 
-import json, os, subprocess, sys, tkinter as tk
+import atexit, concurrent.futures, ctypes, functools, json, os, pickle, \
+    socket, subprocess, sys, tempfile, threading, time
+from ctypes import wintypes
+
+# Bail out before paying the tkinter/Tcl import (~10MB of state in a
+# frozen build) when run on the wrong platform.
+if __name__ == '__main__' and not sys.platform.startswith('win'):
+    sys.exit('Windows only.')
+
+import tkinter as tk
 from tkinter import ttk, messagebox
 
 PROFILE_FILE = 'ip_profiles.json'
+_IP_FIELDS = ('ip', 'mask', 'gw', 'dns1', 'dns2')
+SCHEMA_VERSION = 2  # v2 stores IPs packed as 4-byte ints
+
+# Keep child netsh/powershell processes from flashing a console window.
+CREATE_NO_WINDOW = 0x08000000
+if sys.platform.startswith('win'):
+    _si = subprocess.STARTUPINFO()
+    _si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _si.wShowWindow = subprocess.SW_HIDE
+else:   # module stays importable elsewhere; the main guard bails out
+    _si = None
+    CREATE_NO_WINDOW = 0
+
+_run = functools.partial(subprocess.run, capture_output=True,
+                         creationflags=CREATE_NO_WINDOW, startupinfo=_si)
+
+# orjson is optional too (~5x faster parse, ~3x faster dump than stdlib).
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps          # compact bytes, like the fallback
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# pywin32 is optional: with it, profiles are applied through WMI in-process
+# (no netsh spawn at all); without it we fall back to the netsh script.
+try:
+    import pythoncom
+    import win32com.client as _win32com
+except ImportError:
+    pythoncom = _win32com = None
 
 
 # ---------- Helper wrappers ----------
-def powershell(cmd: str) -> str:
-    """Run arbitrary PowerShell and return stdout."""
-    cp = subprocess.run(['powershell', '-NoLogo', '-Command', cmd],
-                        capture_output=True, text=True)
-    return cp.stdout.strip()
+class _PSHost:
+    """One long-running powershell.exe whose runspace is reused for every
+    call – spawning a fresh PowerShell costs ~250ms-1s just in startup."""
+
+    _SENTINEL = '<<<END>>>'
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ['powershell', '-NoProfile', '-NoLogo', '-Command', '-'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', bufsize=1,
+            creationflags=CREATE_NO_WINDOW, startupinfo=_si)
+        atexit.register(self.proc.terminate)
+
+    def run(self, cmd: str) -> str:
+        self.proc.stdin.write(f"{cmd}\nWrite-Output '{self._SENTINEL}'\n")
+        self.proc.stdin.flush()
+        lines = []
+        for line in self.proc.stdout:
+            if line.rstrip('\r\n') == self._SENTINEL:
+                break
+            lines.append(line)
+        return ''.join(lines).strip()
+
+
+_ps_host = None
+
+
+def _host() -> _PSHost:
+    global _ps_host
+    if _ps_host is None or _ps_host.proc.poll() is not None:
+        _ps_host = _PSHost()
+    return _ps_host
 
 
-def list_adapters():
-    """Return ALL physical adapters (Up or Down, non‑loopback)."""
-    ps = ("Get-NetAdapter | "
-          "Where {$_.HardwareInterface -eq $true -and "
-          "$_.InterfaceDescription -notmatch 'Loopback'} | "
-          "Select -ExpandProperty Name")
-    return [l for l in powershell(ps).splitlines() if l]
+def powershell(cmd: str) -> str:
+    """Run arbitrary PowerShell (in the shared host) and return stdout."""
+    return _host().run(cmd)
+
+
+# IP Helper constants for GetAdaptersAddresses
+_AF_UNSPEC = 0
+_GAA_SKIP_FLAGS = 0x2 | 0x4 | 0x8   # SKIP_ANYCAST | SKIP_MULTICAST | SKIP_DNS_SERVER
+_ERROR_BUFFER_OVERFLOW = 111
+_IF_TYPE_SOFTWARE_LOOPBACK = 24
+_IP_ADAPTER_RECEIVE_ONLY = 0x08
+
+
+class _IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    """IP_ADAPTER_ADDRESSES_LH, declared only up to the fields we read –
+    the buffer is sized by the API so the truncated tail is harmless."""
+
+
+_IP_ADAPTER_ADDRESSES._fields_ = [
+    ('Length', wintypes.ULONG),
+    ('IfIndex', wintypes.DWORD),
+    ('Next', ctypes.POINTER(_IP_ADAPTER_ADDRESSES)),
+    ('AdapterName', ctypes.c_char_p),
+    ('FirstUnicastAddress', ctypes.c_void_p),
+    ('FirstAnycastAddress', ctypes.c_void_p),
+    ('FirstMulticastAddress', ctypes.c_void_p),
+    ('FirstDnsServerAddress', ctypes.c_void_p),
+    ('DnsSuffix', ctypes.c_wchar_p),
+    ('Description', ctypes.c_wchar_p),
+    ('FriendlyName', ctypes.c_wchar_p),
+    ('PhysicalAddress', ctypes.c_ubyte * 8),
+    ('PhysicalAddressLength', wintypes.ULONG),
+    ('Flags', wintypes.ULONG),
+    ('Mtu', wintypes.ULONG),
+    ('IfType', wintypes.ULONG),
+]
+
+
+_adapter_cache = {'t': 0.0, 'v': []}
+_ADAPTER_TTL = 30  # seconds
+
+
+def list_adapters(force=False):
+    """Return ALL physical adapters (Up or Down, non‑loopback).
+
+    The adapter set rarely changes, so results are cached for
+    _ADAPTER_TTL seconds; pass force=True to re-query regardless.
+    """
+    if not force and time.monotonic() - _adapter_cache['t'] < _ADAPTER_TTL:
+        return _adapter_cache['v']
+    iphlpapi = ctypes.WinDLL('iphlpapi')
+    size = wintypes.ULONG(15 * 1024)
+    while True:
+        buf = ctypes.create_string_buffer(size.value)
+        ret = iphlpapi.GetAdaptersAddresses(
+            _AF_UNSPEC, _GAA_SKIP_FLAGS, None, buf, ctypes.byref(size))
+        if ret != _ERROR_BUFFER_OVERFLOW:
+            break
+    if ret != 0:
+        return []
+    names = []
+    adapter = ctypes.cast(buf, ctypes.POINTER(_IP_ADAPTER_ADDRESSES))
+    while adapter:
+        a = adapter.contents
+        if (a.IfType != _IF_TYPE_SOFTWARE_LOOPBACK
+                and not a.Flags & _IP_ADAPTER_RECEIVE_ONLY):
+            names.append(a.FriendlyName)
+        adapter = a.Next
+    _adapter_cache.update(t=time.monotonic(), v=names)
+    return names
+
+
+def _wmi_adapter_config(adapter: str):
+    """Win32_NetworkAdapterConfiguration for *adapter*, or None if WMI
+    is unavailable or the adapter can't be resolved."""
+    if _win32com is None:
+        return None
+    try:
+        svc = _win32com.GetObject(r'winmgmts:\\.\root\cimv2')
+        name = adapter.replace('\\', '\\\\').replace("'", "\\'")
+        for nic in svc.ExecQuery(
+                "SELECT Index FROM Win32_NetworkAdapter "
+                f"WHERE NetConnectionID = '{name}'"):
+            return svc.Get(
+                f'Win32_NetworkAdapterConfiguration.Index={nic.Index}')
+    except pythoncom.com_error:
+        pass    # WMI unavailable or adapter not resolvable: use netsh
+    return None
 
 
 def apply_profile(adapter: str, p: dict):
+    cfg = _wmi_adapter_config(adapter)
+    if cfg is not None:
+        # One COM object, three method calls – no process spawn at all.
+        cfg.EnableStatic([p['ip']], [p['mask']])
+        cfg.SetGateways([p['gw']], [1])
+        cfg.SetDNSServerSearchOrder(
+            [p['dns1']] + ([p['dns2']] if p['dns2'] else []))
+        return
+    # One netsh process running a script beats 2-3 separate spawns –
+    # each spawn re-initializes the whole netsh context.
     cmds = [
-        ['netsh', 'interface', 'ip', 'set', 'address',
-         f'name={adapter}', 'static', p['ip'], p['mask'], p['gw'], '1'],
-        ['netsh', 'interface', 'ip', 'set', 'dns',
-         f'name={adapter}', 'static', p['dns1'], 'primary']
+        f'interface ip set address name="{adapter}" static '
+        f'{p["ip"]} {p["mask"]} {p["gw"]} 1',
+        f'interface ip set dns name="{adapter}" static {p["dns1"]} primary',
     ]
     if p['dns2']:
-        cmds.append(['netsh', 'interface', 'ip', 'add', 'dns',
-                     f'name={adapter}', p['dns2'], 'index=2'])
-    for c in cmds:
-        subprocess.run(c, capture_output=True)
+        cmds.append(f'interface ip add dns name="{adapter}" '
+                    f'{p["dns2"]} index=2')
+    with tempfile.NamedTemporaryFile('w', suffix='.netsh',
+                                     delete=False) as tmp:
+        tmp.write('\n'.join(cmds) + '\n')
+    try:
+        _run(['netsh', '-f', tmp.name])
+    finally:
+        os.unlink(tmp.name)
 
 
 def set_dhcp(adapter: str):
-    subprocess.run(['netsh', 'interface', 'ip', 'set',
-                    'address', f'name={adapter}', 'dhcp'], capture_output=True)
-    subprocess.run(['netsh', 'interface', 'ip', 'set',
-                    'dns', f'name={adapter}', 'dhcp'], capture_output=True)
+    cfg = _wmi_adapter_config(adapter)
+    if cfg is not None:
+        cfg.EnableDHCP()
+        cfg.SetDNSServerSearchOrder()
+        return
+    # The address and DNS resets are independent – overlap the two
+    # netsh spawns so the fallback costs max(t) instead of sum(t).
+    procs = [subprocess.Popen(
+                 ['netsh', 'interface', 'ip', 'set', kind,
+                  f'name={adapter}', 'dhcp'],
+                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                 creationflags=CREATE_NO_WINDOW, startupinfo=_si)
+             for kind in ('address', 'dns')]
+    for proc in procs:
+        proc.wait()
+
+
+def _pack_profiles(p):
+    """On-disk form: dotted-quad strings packed to ints (schema v2) –
+    about a third of the bytes and fewer objects for the decoder."""
+    packed = {}
+    for name, prof in p.items():
+        q = dict(prof)
+        for fld in _IP_FIELDS:
+            v = q.get(fld, '')
+            try:
+                q[fld] = int.from_bytes(socket.inet_aton(v), 'big')
+            except OSError:
+                pass    # empty or malformed: keep the string verbatim
+        packed[name] = q
+    return {'schema': SCHEMA_VERSION, 'profiles': packed}
+
+
+def _unpack_profiles(raw):
+    if not (isinstance(raw, dict) and raw.get('schema') == SCHEMA_VERSION):
+        return raw      # legacy v1 file: plain name -> profile mapping
+    profiles = {}
+    for name, prof in raw['profiles'].items():
+        q = dict(prof)
+        for fld in _IP_FIELDS:
+            v = q.get(fld, '')
+            if isinstance(v, int):
+                q[fld] = socket.inet_ntoa(v.to_bytes(4, 'big'))
+        profiles[name] = q
+    return profiles
 
 
 def load_profiles():
-    if os.path.exists(PROFILE_FILE):
-        with open(PROFILE_FILE) as f:
-            return json.load(f)
-    return {}
+    try:
+        st = os.stat(PROFILE_FILE)
+    except FileNotFoundError:
+        return {}
+    # Sidecar pickle keyed by mtime: relaunches with an unchanged file
+    # are stat-bound instead of JSON-parse-bound.
+    cache = PROFILE_FILE + '.cache'
+    try:
+        with open(cache, 'rb') as f:
+            cmtime, data = pickle.load(f)
+        if cmtime == st.st_mtime_ns:
+            return data
+    except Exception:
+        pass
+    with open(PROFILE_FILE, 'rb') as f:
+        data = _unpack_profiles(_json_loads(f.read()))
+    try:
+        with open(cache, 'wb') as f:
+            pickle.dump((st.st_mtime_ns, data), f, protocol=5)
+    except OSError:
+        pass    # cache is best-effort only
+    return data
 
 
 def save_profiles(p):
-    with open(PROFILE_FILE, 'w') as f:
-        json.dump(p, f, indent=2)
+    # compact output: the file is machine-read only, so no indent;
+    # write-then-rename so a crash mid-write can't leave a torn file
+    tmp = PROFILE_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_json_dumps(_pack_profiles(p)))
+    os.replace(tmp, PROFILE_FILE)
 
 
 # ---------- Profile editor window ----------
 class ProfileEditor(tk.Toplevel):
+    FIELDS = _IP_FIELDS
+    DEFAULTS = {'ip': '', 'mask': '255.255.255.0',
+                'gw': '', 'dns1': '', 'dns2': ''}
+
     def __init__(self, master, name='', data=None, callback=None):
         super().__init__(master)
         self.title('Profile editor')
@@ -73,29 +307,32 @@ class ProfileEditor(tk.Toplevel):
         self.callback = callback
         self.protocol("WM_DELETE_WINDOW", self.destroy)
 
-        # defaults
-        data = data or {'ip': '', 'mask': '255.255.255.0',
-                        'gw': '', 'dns1': '', 'dns2': ''}
+        data = data or self.DEFAULTS
 
-        ttk.Label(self, text='Profile name:').grid(row=0, column=0, sticky='e')
+        # Create the widgets in Python, but collect their grid placements
+        # and run them as one Tcl eval – one interpreter round-trip
+        # instead of one per widget.
+        grid = []
+        lbl = ttk.Label(self, text='Profile name:')
         self.e_name = ttk.Entry(self, width=25)
-        self.e_name.grid(row=0, column=1, padx=5, pady=3)
         self.e_name.insert(0, name)
+        grid += [f'grid {lbl} -row 0 -column 0 -sticky e',
+                 f'grid {self.e_name} -row 0 -column 1 -padx 5 -pady 3']
 
-        fields = ('ip', 'mask', 'gw', 'dns1', 'dns2')
         self.entries = {}
-        for r, fld in enumerate(fields, start=1):
-            ttk.Label(self, text=f'{fld.upper()}:').grid(
-                row=r, column=0, sticky='e')
+        for r, fld in enumerate(self.FIELDS, start=1):
+            lbl = ttk.Label(self, text=f'{fld.upper()}:')
             e = ttk.Entry(self, width=25)
-            e.grid(row=r, column=1, padx=5, pady=3)
             e.insert(0, data.get(fld, ''))
             self.entries[fld] = e
+            grid += [f'grid {lbl} -row {r} -column 0 -sticky e',
+                     f'grid {e} -row {r} -column 1 -padx 5 -pady 3']
 
-        ttk.Button(self, text='Save', command=self._save).grid(
-            row=6, column=0, pady=6)
-        ttk.Button(self, text='Cancel', command=self.destroy).grid(
-            row=6, column=1, pady=6)
+        b_save = ttk.Button(self, text='Save', command=self._save)
+        b_cancel = ttk.Button(self, text='Cancel', command=self.destroy)
+        grid += [f'grid {b_save} -row 6 -column 0 -pady 6',
+                 f'grid {b_cancel} -row 6 -column 1 -pady 6']
+        self.tk.eval('\n'.join(grid))
 
     def _save(self):
         name = self.e_name.get().strip()
@@ -116,9 +353,39 @@ class App(tk.Tk):
         self.resizable(False, False)
 
         self.profiles = load_profiles()
+        # netsh/WMI work runs here so the Tk loop never blocks on it;
+        # COM must be initialized on this worker for the WMI path
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            initializer=pythoncom.CoInitialize if pythoncom else None)
+        self._dirty = False
+        self._flush_scheduled = False
+        atexit.register(self._flush_profiles)
+        # Enumerate adapters concurrently with UI construction so the
+        # first paint isn't stalled behind the adapter query.
+        self._adapters_result = None
+        threading.Thread(target=self._bg_enumerate, daemon=True).start()
         self._build_ui()
-        self._refresh_adapters()
         self._refresh_profiles()
+        self.after(50, self._consume_adapters)
+        self.after_idle(self._prewarm_editor)
+
+    def _prewarm_editor(self):
+        # Build and discard one hidden editor so Tk registers the ttk
+        # class bindings up front; the first real Add opens as fast as
+        # subsequent ones.
+        dlg = ProfileEditor(self)
+        dlg.withdraw()
+        dlg.destroy()
+
+    def _bg_enumerate(self):
+        self._adapters_result = list_adapters()
+
+    def _consume_adapters(self):
+        if self._adapters_result is None:
+            self.after(50, self._consume_adapters)
+        else:
+            self._refresh_adapters()
 
     def _build_ui(self):
         frm = ttk.Frame(self, padding=10)
@@ -127,12 +394,17 @@ class App(tk.Tk):
         ttk.Label(frm, text='Adapter:').grid(row=0, column=0, sticky='e')
         self.cmb_adp = ttk.Combobox(frm, width=30, state='readonly')
         self.cmb_adp.grid(row=0, column=1, sticky='w')
-        ttk.Button(frm, text='Refresh', command=self._refresh_adapters).grid(
+        ttk.Button(frm, text='Refresh',
+                   command=lambda: self._refresh_adapters(force=True)).grid(
             row=0, column=2, padx=4)
 
         ttk.Label(frm, text='Profiles:').grid(row=1, column=0, sticky='ne',
                                               pady=(10, 0))
-        self.lst = tk.Listbox(frm, height=7, width=30)
+        # listvariable hands Tk the whole backing list in one shot,
+        # avoiding per-item growth of the listbox storage
+        self._lb_var = tk.StringVar(value=tuple(self.profiles.keys()))
+        self.lst = tk.Listbox(frm, listvariable=self._lb_var,
+                              height=7, width=30)
         self.lst.grid(row=1, column=1, rowspan=4, sticky='w', pady=(10, 0))
 
         btnfrm = ttk.Frame(frm)
@@ -144,25 +416,39 @@ class App(tk.Tk):
         ttk.Button(btnfrm, text='Delete', width=10,
                    command=self._delete).grid(pady=2)
 
-        ttk.Button(frm, text='Apply profile', width=20,
-                   command=self._apply).grid(row=6, column=0, columnspan=2,
-                                             pady=8)
-        ttk.Button(frm, text='Back to DHCP', width=15,
-                   command=self._dhcp).grid(row=6, column=2, pady=8)
+        self.btn_apply = ttk.Button(frm, text='Apply profile', width=20,
+                                    command=self._apply)
+        self.btn_apply.grid(row=6, column=0, columnspan=2, pady=8)
+        self.btn_dhcp = ttk.Button(frm, text='Back to DHCP', width=15,
+                                   command=self._dhcp)
+        self.btn_dhcp.grid(row=6, column=2, pady=8)
 
     # ---------- List refresh ----------
-    def _refresh_adapters(self):
-        lst = list_adapters()
-        self.cmb_adp['values'] = lst
-        if lst:
-            self.cmb_adp.current(0)
+    def _refresh_adapters(self, force=False):
+        lst = tuple(list_adapters(force=force))
+        if lst != self.cmb_adp['values']:   # skip the Tcl round-trip
+            self.cmb_adp['values'] = lst
+            if lst:
+                self.cmb_adp.current(0)
 
     def _refresh_profiles(self):
-        self.lst.delete(0, 'end')
-        for name in self.profiles:
-            self.lst.insert('end', name)
+        # replace the whole backing list in one Tcl assignment
+        self._lb_var.set(tuple(self.profiles.keys()))
 
     # ---------- CRUD ----------
+    def _mark_dirty(self):
+        """Coalesce rapid edits into one write, 250ms after the last."""
+        self._dirty = True
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after(250, self._flush_profiles)
+
+    def _flush_profiles(self):
+        self._flush_scheduled = False
+        if self._dirty:
+            self._dirty = False
+            save_profiles(self.profiles)
+
     def _add(self):
         ProfileEditor(self, callback=self._save_profile)
 
@@ -175,9 +461,12 @@ class App(tk.Tk):
                       callback=self._save_profile)
 
     def _save_profile(self, name, data):
+        # dict insertion order mirrors listbox order, so an append-only
+        # insert keeps indices in sync without a full rebuild
+        if name not in self.profiles:
+            self.lst.insert('end', name)
         self.profiles[name] = data
-        save_profiles(self.profiles)
-        self._refresh_profiles()
+        self._mark_dirty()
 
     def _delete(self):
         sel = self.lst.curselection()
@@ -186,28 +475,41 @@ class App(tk.Tk):
         name = self.lst.get(sel)
         if messagebox.askyesno('Delete', f'Delete profile “{name}”?'):
             del self.profiles[name]
-            save_profiles(self.profiles)
-            self._refresh_profiles()
+            self._mark_dirty()
+            self.lst.delete(sel)
 
     # ---------- Actions ----------
+    def _submit(self, work, done):
+        """Run *work* on the pool, then *done* back on the Tk thread."""
+        self.btn_apply['state'] = self.btn_dhcp['state'] = 'disabled'
+
+        def _finish(_fut):
+            self.after(0, lambda: (
+                self.btn_apply.configure(state='normal'),
+                self.btn_dhcp.configure(state='normal'),
+                done()))
+
+        self._pool.submit(work).add_done_callback(_finish)
+
     def _apply(self):
         sel = self.lst.curselection()
         if not sel:
             return
         name = self.lst.get(sel)
         adapter = self.cmb_adp.get()
-        apply_profile(adapter, self.profiles[name])
-        messagebox.showinfo('Done', f'Applied “{name}” to {adapter}')
+        self._submit(
+            lambda: apply_profile(adapter, self.profiles[name]),
+            lambda: messagebox.showinfo('Done',
+                                        f'Applied “{name}” to {adapter}'))
 
     def _dhcp(self):
         adapter = self.cmb_adp.get()
-        set_dhcp(adapter)
-        messagebox.showinfo('DHCP', f'{adapter} now set to DHCP')
+        self._submit(
+            lambda: set_dhcp(adapter),
+            lambda: messagebox.showinfo('DHCP',
+                                        f'{adapter} now set to DHCP'))
 
 
 # ---------- Main ----------
 if __name__ == '__main__':
-    if not sys.platform.startswith('win'):
-        messagebox.showerror('Error', 'Windows only.')
-        sys.exit(1)
     App().mainloop()